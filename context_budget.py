@@ -0,0 +1,176 @@
+import re
+import time
+from tokens import estimate_tokens
+
+_THINK_BLOCK = re.compile(r"<think>.*?</think>", re.DOTALL | re.IGNORECASE)
+_OPEN_THINK = re.compile(r"<think>.*", re.DOTALL | re.IGNORECASE)
+# Templates de chat costumam pré-preencher o <think>, deixando só o </think> na saída
+_ORPHAN_CLOSE = re.compile(r"^(?:(?!<think>).)*?</think>", re.DOTALL | re.IGNORECASE)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def strip_think(text):
+    """
+    Remove os blocos de raciocínio <think>...</think>, inclusive um bloco não fechado
+    e o raciocínio antes de um </think> órfão (com o <think> pré-preenchido).
+    """
+    text = _ORPHAN_CLOSE.sub("", text or "", count=1)
+    text = _THINK_BLOCK.sub("", text)
+    text = _OPEN_THINK.sub("", text)
+    return text.strip()
+
+
+def _blocks(text):
+    """ Divide o texto em blocos (separador, unidades): linhas para títulos/listas, sentenças para parágrafos. """
+    blocks = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if paragraph.startswith("#") or "\n" in paragraph:
+            # Títulos e listas são mantidos linha a linha
+            blocks.append(("\n", paragraph.splitlines()))
+        else:
+            blocks.append((" ", _SENTENCE_END.split(paragraph)))
+    return blocks
+
+
+def _dedupe(blocks):
+    """ Remove sentenças e linhas repetidas (mantém a primeira ocorrência) e blocos que ficarem vazios. """
+    seen = set()
+    result = []
+    for separator, units in blocks:
+        kept = []
+        for unit in units:
+            key = " ".join(unit.lower().split())
+            if key and key in seen:
+                continue
+            seen.add(key)
+            kept.append(unit)
+        if kept:
+            result.append((separator, kept))
+    return result
+
+
+def _cap(lengths, available):
+    """ Maior limite L tal que sum(min(tamanho, L)) caiba em `available` (partilha do orçamento). """
+    low, high = 0, max(lengths, default=0)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if sum(min(length, middle) for length in lengths) <= available:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _shorten(unit, max_chars):
+    """ Corta uma sentença ou linha em `max_chars` caracteres, indicando o corte com '...'. """
+    if len(unit) <= max_chars:
+        return unit
+    if max_chars < 4:
+        return ""
+    return unit[:max_chars - 3].rstrip() + "..."
+
+
+def _fit_block(separator, units, max_chars):
+    """ Reduz um bloco a `max_chars` caracteres. """
+    if separator == "\n":
+        # Títulos e listas: todos os itens ficam, os mais longos são encurtados por igual
+        limit = _cap([len(unit) for unit in units], max_chars - (len(units) - 1))
+        lines = [_shorten(unit, limit) for unit in units]
+        return separator.join(line for line in lines if line)
+
+    # Parágrafos: sentenças iniciais que couberem; se nem a primeira couber, ela é cortada
+    kept = []
+    used = 0
+    for unit in units:
+        cost = len(unit) + (1 if kept else 0)
+        if used + cost > max_chars:
+            break
+        kept.append(unit)
+        used += cost
+    return separator.join(kept) if kept else _shorten(units[0], max_chars)
+
+
+def truncate_extractive(text, token_budget):
+    """
+    Reduz o texto ao orçamento de tokens de forma determinística e extrativa.
+
+    Remove sentenças e linhas repetidas e reparte o orçamento entre os blocos:
+    blocos menores que a partilha ficam inteiros e os maiores são reduzidos a ela.
+    Em listas e esboços todos os itens são mantidos, encurtados; em parágrafos
+    ficam as primeiras sentenças. Se não houver espaço para a estrutura, o texto
+    é cortado no limite.
+    """
+    if estimate_tokens(text) <= token_budget:
+        return text
+
+    max_chars = token_budget * 4
+    blocks = _dedupe(_blocks(text))
+    joined = [separator.join(units) for separator, units in blocks]
+    available = max_chars - 2 * (len(blocks) - 1)  # Separadores "\n\n" entre blocos
+    if sum(len(block) for block in joined) <= available:
+        return "\n\n".join(joined)
+
+    limit = _cap([len(block) for block in joined], available)
+    fitted = [
+        block if len(block) <= limit else _fit_block(separator, units, limit)
+        for block, (separator, units) in zip(joined, blocks)
+    ]
+    fitted = [block for block in fitted if block]
+    if limit < 16 or not fitted:
+        return text[:max(max_chars - 3, 0)].rstrip() + "..."
+    return "\n\n".join(fitted)
+
+
+class ContextBudget:
+    """
+    Controla o contexto repassado entre as tarefas de uma Crew sequencial.
+
+    Cada tarefa recebe um guardrail que remove o raciocínio <think>, limita a
+    saída ao orçamento de tokens da etapa e registra as contagens e a latência.
+    """
+
+    def __init__(self):
+        self.stats = []
+        self._last_mark = time.perf_counter()
+
+    def start(self):
+        """ Marca o início da execução (chamar antes do kickoff). """
+        self.stats = []
+        self._last_mark = time.perf_counter()
+
+    def guardrail(self, stage, token_budget=None):
+        """
+        Cria o guardrail da etapa.
+
+        :param stage: Nome da etapa usado no relatório.
+        :param token_budget: Máximo de tokens repassados adiante (None = sem limite, apenas remove o <think>).
+        """
+        def _guardrail(task_output):
+            now = time.perf_counter()
+            raw = task_output.raw or ""
+            content = strip_think(raw)
+            stripped_tokens = estimate_tokens(content)
+            if token_budget is not None:
+                content = truncate_extractive(content, token_budget)
+
+            self.stats.append({
+                "stage": stage,
+                "raw_tokens": estimate_tokens(raw),
+                "without_think_tokens": stripped_tokens,
+                "forwarded_tokens": estimate_tokens(content),
+                "elapsed_s": now - self._last_mark,
+            })
+            self._last_mark = now
+            return True, content
+
+        return _guardrail
+
+    def report(self):
+        """ Imprime as contagens de tokens e a latência de cada etapa. """
+        for stat in self.stats:
+            print(f"[ContextBudget] {stat['stage']}: {stat['elapsed_s']:.2f}s | "
+                  f"tokens: {stat['raw_tokens']} -> {stat['without_think_tokens']} (sem <think>) "
+                  f"-> {stat['forwarded_tokens']} (repassados)")
@@ -0,0 +1,82 @@
+import pytest
+from context_budget import ContextBudget, strip_think, truncate_extractive
+from tokens import estimate_tokens
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("<think>raciocínio</think>\n\nresposta", "resposta"),
+    ("<THINK>a</THINK> resposta <think>b</think>", "resposta"),
+    ("resposta\n<think>raciocínio sem fim", "resposta"),
+    # Template de chat com o <think> pré-preenchido: só o fechamento aparece
+    ("raciocínio…</think>\n\nresposta", "resposta"),
+    ("raciocínio</think>resposta <think>outro</think> final", "resposta  final"),
+    ("resposta sem raciocínio", "resposta sem raciocínio"),
+    ("", ""),
+])
+def test_strip_think(raw, expected):
+    assert strip_think(raw) == expected
+
+
+def _outline(items=12):
+    lines = [f"{i}. Seção {i}: " + "detalhe importante sobre o tópico " * 6 for i in range(1, items + 1)]
+    return "# Plano\n\n" + "\n".join(lines) + "\n\nParágrafo final com a conclusão. Segunda frase do final."
+
+
+def test_truncate_keeps_text_within_budget_unchanged():
+    text = "# Título\n\nUm parágrafo curto."
+    assert truncate_extractive(text, 100) == text
+
+
+@pytest.mark.parametrize("token_budget", [150, 250, 400])
+def test_truncate_keeps_every_outline_item(token_budget):
+    text = _outline()
+    result = truncate_extractive(text, token_budget)
+
+    assert estimate_tokens(result) <= token_budget
+    for i in range(1, 13):
+        assert f"{i}. Seção {i}" in result
+    assert "Parágrafo final com a conclusão." in result
+
+
+def test_truncate_drops_repeated_sentences_first():
+    text = _outline() + "\n\n" + "Frase repetida aqui. " * 6
+    result = truncate_extractive(text, 400)
+
+    assert result.count("Frase repetida aqui.") == 1
+    assert "12. Seção 12" in result
+
+
+def test_truncate_keeps_leading_sentences_of_long_paragraphs():
+    sentences = [f"Sentença número {i} com algum conteúdo relevante." for i in range(40)]
+    text = "# Título\n\n" + " ".join(sentences)
+    result = truncate_extractive(text, 120)
+
+    assert result.startswith("# Título\n\nSentença número 0 ")
+    assert "Sentença número 39" not in result
+    assert estimate_tokens(result) <= 120
+
+
+def test_truncate_hard_cut_when_structure_does_not_fit():
+    result = truncate_extractive("x" * 1000, 10)
+    assert result.endswith("...")
+    assert estimate_tokens(result) <= 10
+
+
+def test_truncate_is_deterministic():
+    assert truncate_extractive(_outline(), 200) == truncate_extractive(_outline(), 200)
+
+
+def test_guardrail_strips_truncates_and_records_stats():
+    class Output:
+        raw = "<think>" + "raciocínio " * 200 + "</think>\n\n" + _outline()
+
+    budget = ContextBudget()
+    budget.start()
+    success, content = budget.guardrail("plan", token_budget=200)(Output())
+
+    assert success
+    assert "<think>" not in content
+    assert estimate_tokens(content) <= 200
+    stat = budget.stats[0]
+    assert stat["stage"] == "plan"
+    assert stat["raw_tokens"] > stat["without_think_tokens"] > stat["forwarded_tokens"]
@@ -1,5 +1,6 @@
 import os
 from crewai import Agent, Task, Crew, LLM
+from context_budget import ContextBudget
 
 llm = LLM(
     model="ollama/deepseek-r1:8b",
@@ -49,6 +50,9 @@ editor = Agent(
     verbose=True
 )
 
+# Limita o contexto repassado entre as tarefas (remove <think> e aplica o orçamento de tokens)
+context_budget = ContextBudget()
+
 plan = Task(
    description=(
         "1. Priorize as últimas tendências, principais players, "
@@ -62,6 +66,7 @@ plan = Task(
     expected_output="Um documento de plano de conteúdo abrangente "
         "com um esboço, análise do público, palavras-chave de SEO e recursos.",
     agent=planner,
+    guardrail=context_budget.guardrail("plan", token_budget=1000),
 )
 
 write = Task(
@@ -80,6 +85,8 @@ write = Task(
     expected_output="Um post de blog bem escrito "
         "em formato markdown, pronto para publicação, cada seção deve ter 2 ou 3 parágrafos.",
     agent=writer,
+    context=[plan],
+    guardrail=context_budget.guardrail("write", token_budget=3000),
 )
 
 edit = Task(
@@ -87,7 +94,9 @@ edit = Task(
                  "erros gramaticais e alinhamento com a voz da marca."),
     expected_output="Um post de blog bem escrito em formato markdown, "
                     "pronto para publicação, cada seção deve ter 2 ou 3 parágrafos.",
-    agent=editor
+    agent=editor,
+    context=[write],
+    guardrail=context_budget.guardrail("edit"),
 )
 
 
@@ -98,7 +107,9 @@ crew = Crew(
 )
 
 inputs = {"topic":"Agentes inteligentes."}
+context_budget.start()
 result = crew.kickoff(inputs=inputs)
+context_budget.report()
 
 print("############")
 print(result)
\ No newline at end of file
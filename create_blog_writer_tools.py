@@ -2,6 +2,8 @@ import os
 from dotenv import load_dotenv
 from crewai import Agent, Task, Crew, Process,LLM
 from crewai_tools import SerperDevTool
+from research_fanout import research
+from context_budget import ContextBudget
 
 load_dotenv()
 deepseek_api_key = os.getenv("DEEPSEEK_API_KEY")
@@ -17,21 +19,6 @@ deepseek_llm = LLM(
     temperature=0.7
 )
 
-researcher = Agent(
-    role="Pesquisador",
-    goal="Coletar e analisar informações relevantes sobre {topic}.",
-    backstory= f"""Você,como pesquisador de conteúdo na web,
-                    é especializado em buscar de informações
-                    disponíveis online.Utiliza diversas ferramentas e técnicas
-                    para encontrar dados relevantes.Deve ter habilidades em pesquisa,
-  pensamento crítico e discernimento para filtrar informações
-  confiáveis e relevantes em meio à vasta quantidade de dados
-  disponíveis na internet.""",
-    llm=deepseek_llm,
-    allow_delegation=False,
-    verbose=True,
-)
-
 planner = Agent(
     role="Planejador de Conteúdo",
     goal="Planejar conteúdo envolvente e factualmente preciso sobre {topic} e também use os conteúdos gerado pelo Pesquisado em {conteudos}",
@@ -75,15 +62,8 @@ editor = Agent(
     verbose=True
 )
 
-search_task = Task(
-    description=
-        "Pesquisar as últimas tendências e principais players sobre {topic}"
-        "Utilize fontes como blogs,artigos científicos, sites de notícias e redes sociais para",
-    expected_output="Um documento com conteúdos relevantes sobre o assunto, para ser usado pelo Planejador de Conteúdo dentro de {conteudos}.",
-    agent=researcher,
-    verbose=True,
-        tools=[search]
-)
+# Limita o contexto repassado entre as tarefas (remove <think> e aplica o orçamento de tokens)
+context_budget = ContextBudget()
 
 plan = Task(
    description=(
@@ -98,6 +78,7 @@ plan = Task(
     expected_output="Um documento de plano de conteúdo abrangente "
         "com um esboço, análise do público, palavras-chave de SEO e recursos.",
     agent=planner,
+    guardrail=context_budget.guardrail("plan", token_budget=1000),
       verbose=True
 )
 
@@ -117,6 +98,8 @@ write = Task(
     expected_output="Um post de blog bem escrito "
         "em formato markdown, pronto para publicação, cada seção deve ter 2 ou 3 parágrafos.",
     agent=writer,
+    context=[plan],
+    guardrail=context_budget.guardrail("write", token_budget=3000),
       verbose=True
 )
 
@@ -126,19 +109,32 @@ edit = Task(
     expected_output="Um post de blog bem escrito em formato markdown, "
                     "pronto para publicação, cada seção deve ter 2 ou 3 parágrafos.",
     agent=editor,
+    context=[write],
+    guardrail=context_budget.guardrail("edit"),
       verbose=True
 )
 
 
 crew = Crew(
-    agents=[researcher,planner, writer, editor],
-    tasks=[search_task, plan, write, edit],
+    agents=[planner, writer, editor],
+    tasks=[plan, write, edit],
     process = Process.sequential,
     verbose=True
 )
 
-inputs = {"topic":"Agentes inteligentes.", "conteudos":""}
+topic = "Agentes inteligentes."
+
+# Pesquisa em paralelo, deduplicada e comprimida antes de chegar ao Planejador
+conteudos, research_metrics = research(topic, search, max_queries=4, token_budget=1500)
+print(f"[Research] {research_metrics['queries']} sub-consultas em {research_metrics['wall_clock_s']:.2f}s | "
+      f"resultados: {research_metrics['raw_results']} -> {research_metrics['unique_results']} | "
+      f"tokens: {research_metrics['raw_tokens']} -> {research_metrics['compressed_tokens']}")
+
+inputs = {"topic": topic, "conteudos": conteudos}
+context_budget.start()
 result = crew.kickoff(inputs=inputs)
+context_budget.report()
 
 print("############")
-print(result)
\ No newline at end of file
+print(result)
+print(f"Tokens de prompt: {result.token_usage.prompt_tokens} | Tokens totais: {result.token_usage.total_tokens}")
@@ -0,0 +1,186 @@
+import re
+import time
+import zlib
+import random
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode, urlsplit
+from tokens import estimate_tokens
+
+# Modelos usados para desdobrar o tema em sub-consultas independentes
+SUBQUERY_TEMPLATES = [
+    "{topic} últimas tendências",
+    "{topic} principais players e empresas",
+    "{topic} notícias recentes",
+    "{topic} artigos científicos",
+    "{topic} blogs e casos de uso",
+    "{topic} discussões em redes sociais",
+]
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_TRACKING_PARAMS = {"fbclid", "gclid"}
+
+
+def generate_subqueries(topic, max_queries=len(SUBQUERY_TEMPLATES)):
+    """
+    Gera sub-consultas de pesquisa a partir do tema.
+    """
+    topic = topic.strip().rstrip(".")
+    return [template.format(topic=topic) for template in SUBQUERY_TEMPLATES[:max_queries]]
+
+
+def _normalize_url(url):
+    """ Normaliza a URL para comparação (sem esquema, 'www.', fragmento, parâmetros de rastreamento e barra final). """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    host = host[4:] if host.startswith("www.") else host
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in _TRACKING_PARAMS
+    ]
+    normalized = f"{host}{parts.path.rstrip('/')}"
+    return f"{normalized}?{urlencode(sorted(query))}" if query else normalized
+
+
+def _shingles(text, size=3):
+    """ Conjunto de shingles de palavras do texto. """
+    words = re.findall(r"\w+", text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+class MinHasher:
+    """
+    Assinaturas MinHash para estimar a similaridade de Jaccard entre textos.
+    """
+
+    def __init__(self, num_perm=64, seed=1):
+        rng = random.Random(seed)
+        self.coefficients = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, text):
+        """ Calcula a assinatura MinHash do texto. """
+        hashes = [zlib.crc32(shingle.encode("utf-8")) for shingle in _shingles(text)]
+        if not hashes:
+            return None
+        return tuple(min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in self.coefficients)
+
+    @staticmethod
+    def similarity(sig_a, sig_b):
+        """ Similaridade de Jaccard estimada entre duas assinaturas. """
+        if sig_a is None or sig_b is None:
+            return 0.0
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+def _parse_results(query, raw):
+    """ Converte o retorno da ferramenta de busca em uma lista de itens {query, title, link, snippet}. """
+    if isinstance(raw, dict):
+        return [
+            {
+                "query": query,
+                "title": item.get("title", ""),
+                "link": item.get("link", ""),
+                "snippet": item.get("snippet", ""),
+            }
+            for item in raw.get("organic", [])
+        ]
+    # Algumas versões da ferramenta retornam texto já formatado
+    return [{"query": query, "title": "", "link": "", "snippet": str(raw)}] if raw else []
+
+
+def run_searches(search_tool, queries, max_workers=4):
+    """
+    Executa as sub-consultas em paralelo e retorna os resultados na ordem das consultas.
+    """
+    def _search(query):
+        try:
+            return _parse_results(query, search_tool.run(search_query=query))
+        except Exception as e:
+            print(f"[Research] Erro na busca '{query}': {e}")
+            return []
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_search, queries))
+
+
+def dedupe_results(results_per_query, similarity_threshold=0.8):
+    """
+    Intercala os resultados das consultas e remove duplicados por URL e por texto quase idêntico.
+    """
+    hasher = MinHasher()
+    seen_urls = set()
+    signatures = []
+    unique = []
+
+    # Round-robin: cada sub-consulta contribui com seus melhores resultados primeiro
+    longest = max((len(results) for results in results_per_query), default=0)
+    for rank in range(longest):
+        for results in results_per_query:
+            if rank >= len(results):
+                continue
+            item = results[rank]
+
+            url = _normalize_url(item["link"]) if item["link"] else None
+            if url and url in seen_urls:
+                continue
+
+            signature = hasher.signature(f"{item['title']} {item['snippet']}")
+            if any(MinHasher.similarity(signature, other) >= similarity_threshold for other in signatures):
+                continue
+
+            if url:
+                seen_urls.add(url)
+            if signature is not None:
+                signatures.append(signature)
+            unique.append(item)
+    return unique
+
+
+def compress_results(items, token_budget=1500):
+    """
+    Monta o material de pesquisa respeitando o orçamento de tokens.
+    """
+    lines = []
+    used = 0
+    for item in items:
+        source = f" ({item['link']})" if item["link"] else ""
+        line = f"- {item['title']}{source}: {item['snippet']}".strip()
+        cost = estimate_tokens(line) + 1
+        if used + cost > token_budget:
+            remaining = (token_budget - used) * 4
+            if remaining > 80:  # Só vale truncar se sobrar espaço útil
+                lines.append(line[:remaining - 3].rstrip() + "...")
+            break
+        lines.append(line)
+        used += cost
+    return "\n".join(lines)
+
+
+def research(topic, search_tool, max_queries=len(SUBQUERY_TEMPLATES), max_workers=4, token_budget=1500):
+    """
+    Executa a etapa de pesquisa completa: sub-consultas paralelas, deduplicação e compressão.
+
+    Returns:
+        tuple: (material comprimido, dicionário de métricas)
+    """
+    start = time.perf_counter()
+    queries = generate_subqueries(topic, max_queries)
+    results_per_query = run_searches(search_tool, queries, max_workers=max_workers)
+    raw_items = [item for results in results_per_query for item in results]
+    unique_items = dedupe_results(results_per_query)
+    content = compress_results(unique_items, token_budget=token_budget)
+
+    metrics = {
+        "queries": len(queries),
+        "raw_results": len(raw_items),
+        "unique_results": len(unique_items),
+        "raw_tokens": sum(estimate_tokens(f"{i['title']} {i['link']} {i['snippet']}") for i in raw_items),
+        "compressed_tokens": estimate_tokens(content),
+        "wall_clock_s": time.perf_counter() - start,
+    }
+    return content, metrics
@@ -0,0 +1,71 @@
+import pytest
+from research_fanout import MinHasher, _normalize_url, compress_results, dedupe_results
+from tokens import estimate_tokens
+
+
+def _item(link, title="", snippet=""):
+    return {"query": "q", "title": title, "link": link, "snippet": snippet}
+
+
+@pytest.mark.parametrize("url_a, url_b", [
+    ("https://www.youtube.com/watch?v=AAA", "https://youtube.com/watch?v=BBB"),
+    ("http://site.com/article.php?id=1", "http://site.com/article.php?id=2"),
+    ("https://site.com/Caminho", "https://site.com/caminho"),
+])
+def test_distinct_pages_keep_distinct_urls(url_a, url_b):
+    assert _normalize_url(url_a) != _normalize_url(url_b)
+
+
+@pytest.mark.parametrize("url_a, url_b", [
+    ("https://www.site.com/post/", "http://site.com/post"),
+    ("https://site.com/post?utm_source=x&utm_medium=y", "https://site.com/post"),
+    ("https://site.com/post?fbclid=abc&id=3", "https://site.com/post?id=3&gclid=def"),
+    ("https://site.com/post?b=2&a=1#comentarios", "https://SITE.com/post?a=1&b=2"),
+])
+def test_equivalent_urls_normalize_the_same(url_a, url_b):
+    assert _normalize_url(url_a) == _normalize_url(url_b)
+
+
+def test_dedupe_by_url_keeps_distinct_query_strings():
+    results = [
+        [_item("https://youtube.com/watch?v=AAA", "Vídeo A", "primeiro vídeo sobre agentes")],
+        [_item("https://youtube.com/watch?v=BBB", "Vídeo B", "outro assunto completamente diferente")],
+        [_item("https://youtube.com/watch?v=AAA&utm_source=x", "Vídeo A", "cópia rastreada")],
+    ]
+    unique = dedupe_results(results)
+    assert [item["title"] for item in unique] == ["Vídeo A", "Vídeo B"]
+
+
+def test_minhash_similarity_separates_near_duplicates():
+    hasher = MinHasher()
+    base = "Agentes inteligentes estão mudando a forma como empresas automatizam processos de negócio em 2025"
+    near = base + " hoje"
+    other = "Receita de bolo de cenoura com cobertura de chocolate para o café da tarde"
+
+    assert MinHasher.similarity(hasher.signature(base), hasher.signature(near)) >= 0.8
+    assert MinHasher.similarity(hasher.signature(base), hasher.signature(other)) < 0.2
+    assert MinHasher.similarity(hasher.signature(""), hasher.signature(base)) == 0.0
+
+
+def test_dedupe_drops_near_duplicate_text_from_other_urls():
+    text = "Agentes inteligentes estão mudando a forma como empresas automatizam processos de negócio em 2025"
+    results = [
+        [_item("https://a.com/1", "Agentes", text)],
+        [_item("https://b.com/2", "Agentes", text + " hoje")],
+        [_item("https://c.com/3", "Bolo", "Receita de bolo de cenoura com cobertura de chocolate")],
+    ]
+    unique = dedupe_results(results)
+    assert [item["link"] for item in unique] == ["https://a.com/1", "https://c.com/3"]
+
+
+@pytest.mark.parametrize("token_budget", [30, 100, 250])
+def test_compress_results_respects_token_budget(token_budget):
+    items = [_item(f"https://site.com/{i}", f"Título {i}", "trecho " * 40) for i in range(20)]
+    content = compress_results(items, token_budget=token_budget)
+    assert content
+    assert estimate_tokens(content) <= token_budget
+
+
+def test_compress_results_keeps_everything_under_budget():
+    items = [_item("https://site.com/1", "Título", "trecho curto")]
+    assert compress_results(items, token_budget=1500) == "- Título (https://site.com/1): trecho curto"
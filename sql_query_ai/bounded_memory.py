@@ -0,0 +1,230 @@
+import math
+import re
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict, deque
+
+_TOKEN = re.compile(r"\w+")
+DEFAULT_NAMESPACE = "default"
+
+# Palavras sem conteúdo que, sem filtro, dominariam a similaridade entre pedidos
+_STOPWORDS = frozenset("""
+    a ao aos as até com como da das de dela dele deles do dos e ela elas ele eles em entre
+    era essa esse esta este eu foi for isso isto já lhe mais mas me mesmo meu minha muito
+    na nas nem no nos nós num numa o os ou para pela pelas pelo pelos por qual quais quando
+    que quem se sem ser seu seus sua suas só também te tem têm ter tu um uma umas uns você
+    vocês cada todos todas todo toda quero gostaria preciso mostre liste retorne traga
+    the of and or to in on for by with from is are what which
+""".split())
+
+
+def _normalize_namespace(namespace):
+    """ Normaliza o nome do namespace (ex.: nome do banco de dados). """
+    return str(namespace).strip().lower() if namespace else DEFAULT_NAMESPACE
+
+
+def _normalize_key(text):
+    """ Chave de deduplicação: texto em minúsculas com espaços colapsados. """
+    return " ".join(str(text).lower().split())
+
+
+def _terms(text):
+    """ Frequência dos termos relevantes (sem stopwords, tokens de uma letra ou com dígitos). """
+    return Counter(
+        token for token in _TOKEN.findall(str(text).lower())
+        if len(token) > 1 and token not in _STOPWORDS and not any(char.isdigit() for char in token)
+    )
+
+
+class _Entry:
+    """ Entrada de memória: conteúdo devolvido na busca e termos indexados. """
+
+    __slots__ = ("key", "context", "metadata", "terms", "created_at")
+
+    def __init__(self, key, context, metadata, terms):
+        self.key = key
+        self.context = context
+        self.metadata = metadata
+        self.terms = terms
+        self.created_at = time.monotonic()
+
+
+class _Namespace:
+    """ Entradas de um namespace em ordem LRU, com índice invertido por termo e por chave. """
+
+    def __init__(self):
+        self.entries = OrderedDict()  # id -> _Entry
+        self.index = defaultdict(set)  # termo -> ids
+        self.keys = {}  # chave -> id
+        self.next_id = 0
+
+    def add(self, entry):
+        entry_id = self.next_id
+        self.next_id += 1
+        self.entries[entry_id] = entry
+        self.keys[entry.key] = entry_id
+        for token in entry.terms:
+            self.index[token].add(entry_id)
+
+    def remove(self, entry_id):
+        entry = self.entries.pop(entry_id)
+        if self.keys.get(entry.key) == entry_id:
+            del self.keys[entry.key]
+        for token in entry.terms:
+            ids = self.index[token]
+            ids.discard(entry_id)
+            if not ids:
+                del self.index[token]
+
+    def idf(self, token):
+        """ Peso IDF suavizado do termo no namespace. """
+        return math.log((len(self.entries) + 1) / (len(self.index.get(token, ())) + 1)) + 1
+
+
+class BoundedMemoryStorage:
+    """
+    Armazenamento de memória limitado para os agentes da CrewAI.
+
+    Substitui o RAGStorage padrão (que cresce sem limite) mantendo, por namespace
+    (ex.: um por banco de dados), no máximo `capacity` entradas com despejo LRU e
+    expiração por idade. A busca usa similaridade de cosseno sobre TF-IDF, com
+    índice invertido e sem chamadas de embedding. O namespace é informado em cada chamada,
+    então execuções concorrentes para bancos diferentes não interferem entre si.
+    """
+
+    def __init__(self, capacity=1000, max_age_seconds=None, latency_window=1000):
+        """
+        :param capacity: Máximo de entradas por namespace.
+        :param max_age_seconds: Idade máxima de uma entrada (None = sem expiração).
+        :param latency_window: Quantidade de buscas recentes usadas nas métricas de latência.
+        """
+        if capacity <= 0:
+            raise ValueError("capacity deve ser maior que zero.")
+
+        self.capacity = capacity
+        self.max_age_seconds = max_age_seconds
+        self._namespaces = defaultdict(_Namespace)
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=latency_window)
+        self._evictions = 0
+        self._searches = 0
+
+    def _expire(self, store):
+        """ Remove as entradas mais antigas que max_age_seconds. """
+        if self.max_age_seconds is None:
+            return
+        limit = time.monotonic() - self.max_age_seconds
+        for entry_id in [i for i, entry in store.entries.items() if entry.created_at < limit]:
+            store.remove(entry_id)
+            self._evictions += 1
+
+    def save(self, value, metadata=None, namespace=None, index_text=None, key=None):
+        """
+        Salva uma entrada no namespace, despejando a menos usada se necessário.
+
+        :param value: Conteúdo devolvido nas buscas.
+        :param metadata: Metadados da entrada (podem ser filtrados na busca).
+        :param namespace: Namespace da entrada (ex.: nome do banco de dados).
+        :param index_text: Texto indexado para a similaridade (padrão: value).
+        :param key: Chave de deduplicação; salvar a mesma chave atualiza a entrada existente
+                    (padrão: index_text normalizado junto com os metadados).
+        """
+        metadata = metadata or {}
+        index_text = value if index_text is None else index_text
+        if key is None:
+            key = (_normalize_key(index_text), tuple(sorted((name, repr(v)) for name, v in metadata.items())))
+        entry = _Entry(key, value, metadata, _terms(index_text))
+        with self._lock:
+            store = self._namespaces[_normalize_namespace(namespace)]
+            self._expire(store)
+            if key in store.keys:
+                store.remove(store.keys[key])
+            store.add(entry)
+            while len(store.entries) > self.capacity:
+                store.remove(next(iter(store.entries)))
+                self._evictions += 1
+
+    def search(self, query, limit=3, score_threshold=0.4, namespace=None, filters=None):
+        """
+        Retorna as entradas do namespace mais similares à consulta (cosseno sobre TF-IDF).
+
+        :param filters: Metadados que a entrada precisa ter com o mesmo valor (ex.: {"json_output": True}).
+
+        Returns:
+            list: Dicionários com 'context', 'metadata' e 'score'.
+        """
+        start = time.perf_counter()
+        query_terms = _terms(query)
+        filters = filters or {}
+        with self._lock:
+            # Buscar não cria o namespace: só save() aloca espaço
+            store = self._namespaces.get(_normalize_namespace(namespace)) or _Namespace()
+            self._expire(store)
+
+            idf = {token: store.idf(token) for token in query_terms}
+            query_weights = {token: count * idf[token] for token, count in query_terms.items()}
+            query_norm = math.sqrt(sum(weight * weight for weight in query_weights.values()))
+
+            # Termos presentes em mais da metade das entradas pontuam, mas não geram candidatos
+            common = len(store.entries) / 2
+            selective = [token for token in query_terms if len(store.index.get(token, ())) <= common]
+            candidates = set()
+            for token in selective or query_terms:
+                candidates.update(store.index.get(token, ()))
+
+            scored = []
+            for entry_id in candidates:
+                entry = store.entries[entry_id]
+                if any(entry.metadata.get(name) != value for name, value in filters.items()):
+                    continue
+                dot = sum(weight * entry.terms.get(token, 0) * idf[token] for token, weight in query_weights.items())
+                entry_norm = math.sqrt(sum((count * store.idf(token)) ** 2 for token, count in entry.terms.items()))
+                score = dot / (query_norm * entry_norm) if dot else 0.0
+                if score >= score_threshold:
+                    scored.append((score, entry_id))
+            scored.sort(reverse=True)
+
+            results = []
+            for score, entry_id in scored[:limit]:
+                store.entries.move_to_end(entry_id)  # Marca como usada recentemente
+                entry = store.entries[entry_id]
+                results.append({"context": entry.context, "metadata": entry.metadata, "score": score})
+
+            self._searches += 1
+            self._latencies.append(time.perf_counter() - start)
+        return results
+
+    def reset(self, namespace=None):
+        """ Limpa um namespace (ou todos, se nenhum for informado). """
+        with self._lock:
+            if namespace is None:
+                self._namespaces.clear()
+            else:
+                self._namespaces.pop(_normalize_namespace(namespace), None)
+
+    def get_metrics(self):
+        """
+        Retorna métricas de tamanho e latência de busca.
+
+        Returns:
+            dict: Entradas por namespace, total, despejos, buscas e latências (ms).
+        """
+        with self._lock:
+            sizes = {name: len(store.entries) for name, store in self._namespaces.items()}
+            latencies = sorted(self._latencies)
+            evictions = self._evictions
+            searches = self._searches
+
+        def _percentile(p):
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+        return {
+            "entries": sizes,
+            "total_entries": sum(sizes.values()),
+            "evictions": evictions,
+            "searches": searches,
+            "search_latency_avg_ms": (sum(latencies) / len(latencies) * 1000) if latencies else 0.0,
+            "search_latency_p95_ms": _percentile(0.95),
+        }
@@ -0,0 +1,98 @@
+import time
+
+import pytest
+from bounded_memory import BoundedMemoryStorage
+
+REQUESTS = [
+    "total de vendas de cada mês de 2024 que os clientes fizeram",
+    "Qual é o nome e o preço dos produtos que custam mais de R$ 100. Eu só quero os 5 primeiros resultados.",
+    "quantidade de pedidos por status",
+    "produtos mais vendidos por categoria",
+    "valor médio dos pedidos por método de pagamento",
+]
+
+
+@pytest.fixture
+def memory():
+    storage = BoundedMemoryStorage()
+    for request in REQUESTS:
+        storage.save(f"Pedido: {request}\nSQL: SELECT ...", {"json_output": False}, "ecommerce", index_text=request)
+    return storage
+
+
+def test_unrelated_request_sharing_filler_words_is_not_returned(memory):
+    results = memory.search("nome dos clientes de São Paulo que compraram mais de 3 vezes", namespace="ecommerce")
+    assert results == []
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("nome e preço dos produtos com preço acima de R$ 200, apenas os 10 primeiros", REQUESTS[1]),
+    ("total de vendas por mês em 2023", REQUESTS[0]),
+    ("número de pedidos em cada status", REQUESTS[2]),
+    ("média do valor dos pedidos por forma de pagamento", REQUESTS[4]),
+])
+def test_similar_request_ranks_first(memory, query, expected):
+    results = memory.search(query, namespace="ecommerce")
+    assert results and results[0]["context"].startswith(f"Pedido: {expected}\n")
+
+
+def test_same_request_updates_existing_entry():
+    storage = BoundedMemoryStorage()
+    storage.save("v1", {"json_output": False}, "ecommerce", index_text="Produtos mais vendidos")
+    storage.save("v2", {"json_output": False}, "ecommerce", index_text="  produtos   MAIS vendidos ")
+
+    results = storage.search("produtos mais vendidos", namespace="ecommerce")
+    assert [result["context"] for result in results] == ["v2"]
+    assert storage.get_metrics()["entries"] == {"ecommerce": 1}
+
+
+def test_search_filters_by_metadata():
+    storage = BoundedMemoryStorage()
+    storage.save("json", {"json_output": True}, "ecommerce", index_text="produtos mais vendidos")
+    storage.save("tabular", {"json_output": False}, "ecommerce", index_text="produtos mais vendidos")
+
+    results = storage.search("produtos mais vendidos", namespace="ecommerce", filters={"json_output": False})
+    assert [result["context"] for result in results] == ["tabular"]
+
+
+def test_namespaces_are_isolated_and_normalized():
+    storage = BoundedMemoryStorage()
+    storage.save("ecommerce", namespace=" Ecommerce ", index_text="produtos mais vendidos")
+    storage.save("clinica", namespace="clinica", index_text="pacientes por convênio")
+
+    assert storage.search("produtos vendidos", namespace="ECOMMERCE")[0]["context"] == "ecommerce"
+    assert storage.search("produtos vendidos", namespace="clinica") == []
+    assert storage.search("produtos vendidos", namespace="inexistente") == []
+
+    storage.reset("  CLINICA")
+    assert storage.get_metrics()["entries"] == {"ecommerce": 1}
+
+
+def test_capacity_evicts_least_recently_used():
+    storage = BoundedMemoryStorage(capacity=2)
+    storage.save("a", index_text="produtos vendidos")
+    storage.save("b", index_text="pedidos atrasados")
+    storage.search("produtos vendidos")  # "a" passa a ser a mais recente
+    storage.save("c", index_text="clientes inativos")
+
+    assert storage.search("pedidos atrasados") == []
+    assert storage.search("produtos vendidos")[0]["context"] == "a"
+    assert storage.get_metrics()["evictions"] == 1
+
+
+def test_entries_expire_by_age():
+    storage = BoundedMemoryStorage(max_age_seconds=0.01)
+    storage.save("a", index_text="produtos vendidos")
+    time.sleep(0.02)
+
+    assert storage.search("produtos vendidos") == []
+    assert storage.get_metrics()["total_entries"] == 0
+
+
+def test_metrics_track_searches_and_latency(memory):
+    memory.search("produtos mais vendidos", namespace="ecommerce")
+    metrics = memory.get_metrics()
+
+    assert metrics["searches"] == 1
+    assert metrics["total_entries"] == len(REQUESTS)
+    assert metrics["search_latency_p95_ms"] >= metrics["search_latency_avg_ms"] > 0
@@ -1,17 +1,30 @@
 from dotenv import load_dotenv
 from crewai import Agent, Task, Crew, Process
 from crewai_tools import FileReadTool
+from bounded_memory import BoundedMemoryStorage
 
 class SQLQueryCrew:
     """
     Classe para organizar agentes, tarefas e a execução da geração de consultas SQL.
     """
 
-    def __init__(self):
+    def __init__(self, memory_capacity=1000, memory_max_age_seconds=3600, memory_results=3):
+        """
+        Args:
+            memory_capacity (int): Máximo de entradas de memória por banco de dados.
+            memory_max_age_seconds (float): Idade máxima de uma entrada de memória (None = sem expiração).
+            memory_results (int): Quantidade de consultas anteriores incluídas no pedido ao agente.
+        """
         load_dotenv()  # Carregar variáveis de ambiente
         self.llm = "gpt-4o-mini"  # Definir o modelo de linguagem usado pelo agente
 
         self.schema_tool = FileReadTool()
+
+        # Memória limitada (LRU + idade) e separada por banco de dados. A memória da Crew fica
+        # desligada: ela criaria a LongTermMemory em SQLite (cresce sem limite) e uma chamada
+        # extra ao LLM (TaskEvaluator) após cada tarefa.
+        self.memory = BoundedMemoryStorage(capacity=memory_capacity, max_age_seconds=memory_max_age_seconds)
+        self.memory_results = memory_results
         self.crew = None  # Será inicializado no create_crew()
 
         # Criar a Crew no momento da inicialização
@@ -30,7 +43,6 @@ class SQLQueryCrew:
             ),
             tools=[self.schema_tool],
             verbose=True,
-            memory=True,
             llm=self.llm
         )
 
@@ -50,6 +62,11 @@ class SQLQueryCrew:
                 corretas conforme a estrutura do YAML.
                 
                 O valor inserido em `json_output` é {json_output}.
+
+                Consultas geradas anteriormente para pedidos semelhantes
+                neste banco (use como referência apenas se forem úteis):
+
+                {memoria}
                 
                 IMPORTANTE:
                 - **Formato de Retorno:**  
@@ -99,8 +116,35 @@ class SQLQueryCrew:
         Returns:
             str: A consulta SQL gerada no formato esperado.
         """
-        result = self.crew.kickoff(inputs=inputs).raw
+        # Cada banco de dados tem seu próprio namespace de memória, passado em cada chamada
+        database_name = inputs["database_name"]
+        memories = self.memory.search(
+            inputs["user_request"],
+            limit=self.memory_results,
+            namespace=database_name,
+            filters={"json_output": inputs["json_output"]}  # Consulta JSON não serve de exemplo para tabular
+        )
+        memoria = "\n\n".join(memory["context"] for memory in memories) or "Nenhuma."
+
+        result = self.crew.kickoff(inputs={**inputs, "memoria": memoria}).raw
         result = result.replace("sql","")  # Remover as crases triplas para evitar problemas com formatação de código
         result = result.replace("```", "")  # Remover as crases triplas para evitar problemas com formatação de código
-        
-        return result
\ No newline at end of file
+
+        # Só o pedido é indexado; repetir o pedido atualiza a entrada em vez de duplicá-la
+        if result.strip():
+            self.memory.save(
+                f"Pedido: {inputs['user_request']}\nSQL: {result.strip()}",
+                {"json_output": inputs["json_output"]},
+                namespace=database_name,
+                index_text=inputs["user_request"]
+            )
+        return result
+
+    def memory_metrics(self):
+        """
+        Retorna as métricas da memória do agente.
+
+        Returns:
+            dict: Entradas por banco de dados, despejos e latência de busca.
+        """
+        return self.memory.get_metrics()
@@ -1,7 +1,6 @@
 import os
 import pandas as pd
 from crew_query import SQLQueryCrew
-from postgres_connection import PostgresConnection  # Certifique-se de que está importando a conexão corretamente
 from postgres_databases import PostgresDatabases
 
 #schema path
@@ -24,20 +23,20 @@ sql_query = sql_crew.kickoff(inputs)
 
 print("\n🔍 Consulta SQL Gerada:\n")
 print(sql_query)
+print(f"Métricas de memória: {sql_crew.memory_metrics()}")
 
-ecommerce_database = PostgresDatabases.ECOMMERCE
+# Consultas somente leitura são roteadas para uma réplica; o resto vai para o primário
+router = PostgresDatabases.get_router("ecommerce")
 
-conn = PostgresConnection(database_uri=ecommerce_database)
-conn.connect()
+with router.connection_for(sql_query) as conn:
+    print(conn.get_current_database())
 
-print(conn.get_current_database())
+    cursor = conn.cursor
+    cursor.execute(sql_query)
+    # Obtendo os resultados
+    results = cursor.fetchall()
 
-cursor = conn.cursor
-cursor.execute(sql_query)
-# Obtendo os resultados
-results = cursor.fetchall()
-
-colunas = conn.get_colunas()
+    colunas = conn.get_colunas()
 
 df = pd.DataFrame(results, columns=colunas)
 
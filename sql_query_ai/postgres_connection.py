@@ -12,13 +12,16 @@ class PostgresConnection:
     # Definições de strings de conexão
 
 
-    def __init__(self, database_uri=None):
+    def __init__(self, database_uri=None, connect_timeout=None):
         """
         Inicializa com a URI do banco de dados.
+
+        :param connect_timeout: Timeout (s) da conexão; None usa o padrão do libpq (sem limite).
         """
         self.conn = None
         self.cursor = None
         self.database_uri = database_uri
+        self.connect_timeout = connect_timeout
         
         
     def connect(self):
@@ -26,7 +29,10 @@ class PostgresConnection:
         Estabelece a conexão com o banco de dados PostgreSQL.
         """
         try:
-            self.conn = psycopg2.connect(self.database_uri)
+            if self.connect_timeout is not None:
+                self.conn = psycopg2.connect(self.database_uri, connect_timeout=self.connect_timeout)
+            else:
+                self.conn = psycopg2.connect(self.database_uri)
             self.cursor = self.conn.cursor()
             print(f"[PostgresConnection] Conexão estabelecida com sucesso: {self.database_uri}")
         except OperationalError as e:
@@ -1,41 +1,96 @@
 import os
+import threading
 from dotenv import load_dotenv
+from replica_router import ReplicaRouter
 
-class PostgresDatabases:
+
+class _PostgresDatabasesMeta(type):
+    """Permite acesso como PostgresDatabases.ECOMMERCE e PostgresDatabases["clinica"] sem carregar no import."""
+
+    def __getattr__(cls, attr):
+        if attr.isupper() and attr.lower() in cls._DATABASE_NAMES:
+            return cls.get_database_uri(attr)
+        raise AttributeError(f"type object '{cls.__name__}' has no attribute '{attr}'")
+
+    def __getitem__(cls, name):
+        return cls.get_database_uri(name)
+
+
+class PostgresDatabases(metaclass=_PostgresDatabasesMeta):
     """Classe estática para gerenciar conexões com múltiplos bancos de dados PostgreSQL."""
 
-    # Carrega as variáveis de ambiente uma única vez
-    load_dotenv()
-    _database_uri = os.getenv("DATABASE_URI", "").rstrip("/")  # Evita barra duplicada
+    _DATABASE_NAMES = ("ecommerce", "clinica", "evolution")
 
-    if not _database_uri:
-        raise ValueError("DATABASE_URI não foi definida no ambiente.")
+    # Preenchidos sob demanda em _load(), evitando falhar ou bloquear no import
+    _databases = None
+    _routers = None
+    _lock = threading.Lock()
 
-    # Dicionário de mapeamento dos bancos de dados
-    _databases = {
-        "ecommerce": f"{_database_uri}/ecommerce",
-        "clinica": f"{_database_uri}/clinica",
-        "evolution": f"{_database_uri}/evolution"
-        
-    }
+    @staticmethod
+    def _split_uris(value):
+        """Converte uma lista separada por vírgulas em URIs sem barra final."""
+        return [uri.strip().rstrip("/") for uri in (value or "").split(",") if uri.strip()]
 
     @staticmethod
-    def get_database_uri(name: str):
-        """Retorna a URI do banco de dados com base no nome fornecido."""
+    def _load():
+        """Carrega as variáveis de ambiente e monta o registro na primeira utilização."""
+        if PostgresDatabases._databases is not None:
+            return
+        with PostgresDatabases._lock:
+            if PostgresDatabases._databases is not None:
+                return
+
+            load_dotenv()
+            database_uri = os.getenv("DATABASE_URI", "").rstrip("/")  # Evita barra duplicada
+            if not database_uri:
+                raise ValueError("DATABASE_URI não foi definida no ambiente.")
+
+            # Réplicas padrão para todos os bancos; DATABASE_REPLICA_URIS_<NOME> sobrescreve por banco
+            default_replicas = PostgresDatabases._split_uris(os.getenv("DATABASE_REPLICA_URIS"))
+            strategy = os.getenv("DATABASE_REPLICA_STRATEGY", "least_connections")
+            # Intervalo (s) das verificações de saúde que ejetam e readmitem réplicas; 0 desativa
+            health_interval = float(os.getenv("DATABASE_REPLICA_HEALTH_INTERVAL", "10"))
+
+            databases = {}
+            routers = {}
+            for name in PostgresDatabases._DATABASE_NAMES:
+                databases[name] = f"{database_uri}/{name}"
+                override = os.getenv(f"DATABASE_REPLICA_URIS_{name.upper()}")
+                if override is not None:
+                    replicas = PostgresDatabases._split_uris(override)
+                else:
+                    replicas = [f"{uri}/{name}" for uri in default_replicas]
+                routers[name] = ReplicaRouter(databases[name], replicas, strategy=strategy)
+                if replicas and health_interval > 0:
+                    routers[name].start_health_checks(health_interval)
+
+            PostgresDatabases._routers = routers
+            PostgresDatabases._databases = databases
+
+    @staticmethod
+    def _validate(name: str):
         name = name.lower()
-        if name not in PostgresDatabases._databases:
-            raise ValueError(f"Banco de dados '{name}' não encontrado. Escolha entre: {list(PostgresDatabases._databases.keys())}")
+        if name not in PostgresDatabases._DATABASE_NAMES:
+            raise ValueError(f"Banco de dados '{name}' não encontrado. Escolha entre: {list(PostgresDatabases._DATABASE_NAMES)}")
+        PostgresDatabases._load()
+        return name
+
+    @staticmethod
+    def get_database_uri(name: str):
+        """Retorna a URI do banco de dados (primário) com base no nome fornecido."""
+        name = PostgresDatabases._validate(name)
         return PostgresDatabases._databases[name]
 
     @staticmethod
-    def __getitem__(name: str):
-        """Permite acessar o banco de dados como se fosse um dicionário."""
-        return PostgresDatabases.get_database_uri(name)
+    def get_router(name: str) -> ReplicaRouter:
+        """Retorna o roteador de réplicas do banco de dados."""
+        name = PostgresDatabases._validate(name)
+        return PostgresDatabases._routers[name]
 
-    # Propriedades estáticas para acesso direto
-    ECOMMERCE = _databases["ecommerce"]
-    CLINICA = _databases["clinica"]
-    EVOLUTION = _databases["evolution"]
+    @staticmethod
+    def get_uri_for_query(name: str, sql_query: str):
+        """Retorna a URI de uma réplica se a consulta for somente leitura; caso contrário, a do primário."""
+        return PostgresDatabases.get_router(name).get_uri(sql_query)
 
 # Exemplo de uso
 if __name__ == "__main__":
@@ -43,5 +98,6 @@ if __name__ == "__main__":
         print(PostgresDatabases.ECOMMERCE)  # Acesso direto
         print(PostgresDatabases["clinica"])  # Acesso via string
         print(PostgresDatabases.get_database_uri("evolution"))  # Acesso via método
+        print(PostgresDatabases.get_uri_for_query("ecommerce", "SELECT 1;"))  # Roteamento de leitura
     except ValueError as e:
-        print(f"Erro: {e}")
\ No newline at end of file
+        print(f"Erro: {e}")
@@ -0,0 +1,120 @@
+import re
+
+# Palavras-chave que tornam uma instrução potencialmente de escrita (ou com efeitos colaterais)
+_WRITE_KEYWORDS = re.compile(
+    r"\b(INSERT|UPDATE|DELETE|MERGE|UPSERT|CREATE|ALTER|DROP|TRUNCATE|GRANT|REVOKE|"
+    r"COPY|LOCK|CALL|DO|EXECUTE|PREPARE|VACUUM|ANALYZE|CLUSTER|REINDEX|REFRESH|"
+    r"COMMENT|SET|RESET|LISTEN|NOTIFY|INTO|NEXTVAL|SETVAL|PG_ADVISORY_\w+|"
+    r"PG_TERMINATE_BACKEND|PG_CANCEL_BACKEND|DBLINK\w*|LO_\w+)\b",
+    re.IGNORECASE,
+)
+_ROW_LOCK = re.compile(r"\bFOR\s+(NO\s+KEY\s+)?(UPDATE|SHARE|KEY\s+SHARE)\b", re.IGNORECASE)
+_DOLLAR_TAG = re.compile(r"\$([A-Za-z_][A-Za-z_0-9]*)?\$")
+
+
+def _is_identifier_char(char):
+    return char.isalnum() or char in "_$"
+
+
+def _strip_literals_and_comments(sql_query):
+    """
+    Percorre a consulta da esquerda para a direita, trocando literais de texto por ''
+    e comentários por espaço.
+
+    Trata '--', '/* */' (aninhados), '...', E'...', "identificadores" e $tag$...$tag$.
+    Retorna None se algum literal, identificador ou comentário não for fechado.
+    """
+    out = []
+    i = 0
+    length = len(sql_query)
+    while i < length:
+        char = sql_query[i]
+        previous = sql_query[i - 1] if i > 0 else ""
+
+        if sql_query.startswith("--", i):
+            end = sql_query.find("\n", i)
+            i = length if end == -1 else end
+            out.append(" ")
+        elif sql_query.startswith("/*", i):
+            depth = 0
+            while i < length:
+                if sql_query.startswith("/*", i):
+                    depth += 1
+                    i += 2
+                elif sql_query.startswith("*/", i):
+                    depth -= 1
+                    i += 2
+                    if depth == 0:
+                        break
+                else:
+                    i += 1
+            if depth:
+                return None
+            out.append(" ")
+        elif char == "'":
+            # E'...' aceita escapes com barra invertida
+            escapes = previous in "eE" and (i < 2 or not _is_identifier_char(sql_query[i - 2]))
+            i += 1
+            while True:
+                if i >= length:
+                    return None
+                if escapes and sql_query[i] == "\\":
+                    i += 2
+                elif sql_query[i] == "'":
+                    if sql_query.startswith("''", i):
+                        i += 2
+                    else:
+                        i += 1
+                        break
+                else:
+                    i += 1
+            out.append("''")
+        elif char == '"':
+            # Identificadores entre aspas mantêm o conteúdo para a verificação de palavras-chave
+            end = i + 1
+            while True:
+                end = sql_query.find('"', end)
+                if end == -1:
+                    return None
+                if sql_query.startswith('""', end):
+                    end += 2
+                    continue
+                break
+            out.append(" " + sql_query[i + 1:end].replace('""', '"') + " ")
+            i = end + 1
+        elif char == "$" and not _is_identifier_char(previous) and _DOLLAR_TAG.match(sql_query, i):
+            tag = _DOLLAR_TAG.match(sql_query, i).group(0)
+            end = sql_query.find(tag, i + len(tag))
+            if end == -1:
+                return None
+            out.append("''")
+            i = end + len(tag)
+        else:
+            out.append(char)
+            i += 1
+    return "".join(out)
+
+
+def is_read_only(sql_query):
+    """
+    Verifica de forma conservadora se a consulta é comprovadamente somente leitura.
+
+    Qualquer dúvida (múltiplas instruções, palavras-chave de escrita, travas de linha,
+    literais ou comentários não fechados) retorna False, fazendo a consulta cair no primário.
+    """
+    if not sql_query or not sql_query.strip():
+        return False
+
+    # Remove literais e comentários para não confundir valores de texto com comandos
+    text = _strip_literals_and_comments(sql_query)
+    if text is None:
+        return False
+    text = text.strip().rstrip(";").strip()
+
+    if ";" in text:
+        return False  # Mais de uma instrução
+    if not re.match(r"^(SELECT|WITH)\b", text, re.IGNORECASE):
+        return False
+    if _WRITE_KEYWORDS.search(text) or _ROW_LOCK.search(text):
+        return False
+    return True
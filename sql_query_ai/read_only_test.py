@@ -0,0 +1,43 @@
+import pytest
+from read_only import is_read_only
+
+
+@pytest.mark.parametrize("sql_query", [
+    "SELECT nome, preco FROM produtos WHERE preco > 100 LIMIT 5;",
+    "\n  WITH caros AS (SELECT * FROM produtos WHERE preco > 100) SELECT nome FROM caros",
+    "-- comentário\nSELECT 'delete; drop' FROM produtos",
+    "SELECT 1 /* it's fine */",
+    "SELECT 1 /* externo /* aninhado */ ainda comentário */",
+    "SELECT E'it\\'s; DROP TABLE x' AS texto",
+    "SELECT $$; DELETE FROM t$$, $tag$ it's $tag$",
+    "SELECT nome FROM produtos WHERE id = $1",
+    'SELECT "nome" FROM "produtos"',
+])
+def test_read_only_queries(sql_query):
+    assert is_read_only(sql_query)
+
+
+@pytest.mark.parametrize("sql_query", [
+    "",
+    "   ",
+    "UPDATE produtos SET preco = 1",
+    "SELECT * FROM produtos FOR UPDATE",
+    "SELECT 1; DELETE FROM produtos",
+    "WITH d AS (DELETE FROM t RETURNING *) SELECT * FROM d",
+    "SELECT nextval('seq')",
+    "SELECT * INTO copia FROM produtos",
+    'SELECT "nextval"(\'seq\')',
+    # Apóstrofos dentro de comentários não podem esconder instruções seguintes
+    "SELECT 1 -- don't\n; DROP TABLE x; -- '",
+    "SELECT 1 /* it's */ ; DELETE FROM t WHERE 'a'='a'",
+    # E'...' escapa a aspa, então o literal continua até a próxima aspa
+    "SELECT E'\\'' ; DELETE FROM t; SELECT ''",
+    # Literais, comentários e dollar quotes não fechados
+    "SELECT 'aberto",
+    "SELECT 1 /* aberto",
+    "SELECT 1 /* /* */",
+    "SELECT $tag$ aberto",
+    'SELECT "aberto',
+])
+def test_not_read_only_queries(sql_query):
+    assert not is_read_only(sql_query)
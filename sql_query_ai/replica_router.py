@@ -0,0 +1,196 @@
+import threading
+import time
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2 import OperationalError
+
+from postgres_connection import PostgresConnection
+from read_only import is_read_only
+
+
+class ReplicaNode:
+    """
+    Estado de uma réplica: conexões em uso, latência observada e saúde.
+    """
+
+    def __init__(self, uri):
+        self.uri = uri
+        self.active_connections = 0
+        self.latency = None  # Média móvel exponencial em segundos
+        self.healthy = True
+        self.failures = 0
+
+    def record_latency(self, elapsed, alpha=0.3):
+        """ Atualiza a média móvel exponencial da latência. """
+        self.latency = elapsed if self.latency is None else alpha * elapsed + (1 - alpha) * self.latency
+
+
+class ReplicaRouter:
+    """
+    Roteia consultas de um banco lógico entre o primário e suas réplicas de leitura.
+
+    Consultas comprovadamente somente leitura vão para a réplica saudável escolhida
+    pela estratégia ('least_connections' ou 'latency'); todo o resto vai para o primário.
+    """
+
+    STRATEGIES = ("least_connections", "latency")
+
+    def __init__(self, primary_uri, replica_uris=None, strategy="least_connections",
+                 max_failures=3, connect_timeout=2):
+        """
+        :param primary_uri: URI do banco primário.
+        :param replica_uris: Lista de URIs das réplicas de leitura.
+        :param strategy: 'least_connections' ou 'latency'.
+        :param max_failures: Falhas consecutivas antes de ejetar uma réplica.
+        :param connect_timeout: Timeout (s) das conexões com as réplicas e da verificação de saúde.
+        """
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Estratégia '{strategy}' inválida. Escolha entre: {list(self.STRATEGIES)}")
+
+        self.primary_uri = primary_uri
+        self.replicas = [ReplicaNode(uri) for uri in (replica_uris or [])]
+        self.strategy = strategy
+        self.max_failures = max_failures
+        self.connect_timeout = connect_timeout
+        self._lock = threading.Lock()
+        self._health_thread = None
+        self._stop_event = threading.Event()
+
+    def _score(self, node):
+        """ Menor pontuação = réplica preferida. """
+        latency = node.latency if node.latency is not None else 0.0
+        if self.strategy == "latency":
+            return ((node.active_connections + 1) * latency, node.active_connections)
+        return (node.active_connections, latency)
+
+    def _pick(self):
+        """ Réplica saudável com menor pontuação (chamar com o lock adquirido). """
+        healthy = [node for node in self.replicas if node.healthy]
+        return min(healthy, key=self._score) if healthy else None
+
+    def choose_replica(self):
+        """ Retorna a réplica saudável com menor pontuação, ou None se não houver. """
+        with self._lock:
+            return self._pick()
+
+    def acquire_replica(self):
+        """
+        Escolhe a réplica e já contabiliza a conexão no mesmo trecho com lock, para que
+        threads concorrentes vejam a contagem atualizada. Liberar com release_replica().
+        """
+        with self._lock:
+            node = self._pick()
+            if node:
+                node.active_connections += 1
+            return node
+
+    def release_replica(self, node):
+        """ Devolve uma conexão obtida com acquire_replica(). """
+        with self._lock:
+            node.active_connections -= 1
+
+    def get_uri(self, sql_query):
+        """ Retorna a URI que deve executar a consulta. """
+        if is_read_only(sql_query):
+            node = self.choose_replica()
+            if node:
+                return node.uri
+        return self.primary_uri
+
+    def mark_failure(self, node):
+        """ Registra uma falha e ejeta a réplica ao atingir o limite. """
+        with self._lock:
+            node.failures += 1
+            if node.healthy and node.failures >= self.max_failures:
+                node.healthy = False
+                print(f"[ReplicaRouter] Réplica ejetada: {node.uri}")
+
+    def mark_success(self, node, elapsed=None):
+        """ Zera as falhas, readmite a réplica e registra a latência. """
+        with self._lock:
+            node.failures = 0
+            if elapsed is not None:
+                node.record_latency(elapsed)
+            if not node.healthy:
+                node.healthy = True
+                print(f"[ReplicaRouter] Réplica readmitida: {node.uri}")
+
+    @contextmanager
+    def connection_for(self, sql_query):
+        """
+        Abre uma PostgresConnection no destino adequado para a consulta.
+
+        Réplicas são abertas em modo somente leitura; se a réplica escolhida
+        não conectar, a consulta cai no primário.
+        """
+        node = self.acquire_replica() if is_read_only(sql_query) else None
+        if node:
+            # Um host de réplica que descarta pacotes não pode segurar a consulta até o timeout do TCP
+            conn = PostgresConnection(database_uri=node.uri, connect_timeout=self.connect_timeout)
+        else:
+            conn = PostgresConnection(database_uri=self.primary_uri)
+        try:
+            start = time.perf_counter()
+            conn.connect()
+            if node and not conn.conn:
+                self.mark_failure(node)
+                self.release_replica(node)
+                node = None
+                conn = PostgresConnection(database_uri=self.primary_uri)
+                conn.connect()
+            elif node:
+                conn.conn.set_session(readonly=True)
+                # Só o tempo de conexão entra na latência, como na verificação de saúde;
+                # o tempo da consulta do chamador não diz nada sobre a réplica
+                self.mark_success(node, time.perf_counter() - start)
+
+            try:
+                yield conn
+            except OperationalError:
+                if node:
+                    self.mark_failure(node)  # Réplica caiu durante a consulta
+                raise
+        finally:
+            conn.disconnect()
+            if node:
+                self.release_replica(node)
+
+    def check_health(self):
+        """ Executa 'SELECT 1' em cada réplica, ejetando ou readmitindo conforme o resultado. """
+        for node in self.replicas:
+            start = time.perf_counter()
+            try:
+                conn = psycopg2.connect(node.uri, connect_timeout=self.connect_timeout)
+                elapsed = time.perf_counter() - start
+                try:
+                    with conn.cursor() as cursor:
+                        cursor.execute("SELECT 1;")
+                        cursor.fetchone()
+                finally:
+                    conn.close()
+            except OperationalError as e:
+                print(f"[ReplicaRouter] Falha na verificação de saúde de {node.uri}: {str(e)}")
+                self.mark_failure(node)
+            else:
+                self.mark_success(node, elapsed)
+
+    def start_health_checks(self, interval=10):
+        """ Inicia verificações de saúde periódicas em uma thread daemon. """
+        if self._health_thread and self._health_thread.is_alive():
+            return
+        self._stop_event.clear()
+
+        def _loop():
+            while not self._stop_event.wait(interval):
+                self.check_health()
+
+        self._health_thread = threading.Thread(target=_loop, name="replica-health-check", daemon=True)
+        self._health_thread.start()
+
+    def stop_health_checks(self):
+        """ Interrompe as verificações de saúde periódicas. """
+        self._stop_event.set()
+        if self._health_thread:
+            self._health_thread.join()
+            self._health_thread = None
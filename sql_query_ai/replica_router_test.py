@@ -0,0 +1,160 @@
+import threading
+
+import psycopg2
+import pytest
+from replica_router import ReplicaRouter
+
+PRIMARY = "postgresql://primary/ecommerce"
+REPLICAS = ["postgresql://r1/ecommerce", "postgresql://r2/ecommerce", "postgresql://r3/ecommerce"]
+
+
+class FakeCursor:
+    def execute(self, query):
+        pass
+
+    def fetchone(self):
+        return (1,)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, uri):
+        self.uri = uri
+        self.readonly = False
+
+    def cursor(self):
+        return FakeCursor()
+
+    def set_session(self, readonly=False):
+        self.readonly = readonly
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_connect(monkeypatch):
+    """Substitui psycopg2.connect; URIs em `down` falham e cada chamada fica registrada."""
+    state = {"down": set(), "calls": []}
+
+    def _connect(uri, **kwargs):
+        state["calls"].append((uri, kwargs))
+        if uri in state["down"]:
+            raise psycopg2.OperationalError(f"{uri} indisponível")
+        return FakeConnection(uri)
+
+    monkeypatch.setattr(psycopg2, "connect", _connect)
+    return state
+
+
+def test_replica_ejected_after_max_failures(fake_connect):
+    router = ReplicaRouter(PRIMARY, REPLICAS[:1], max_failures=3)
+    fake_connect["down"].add(REPLICAS[0])
+
+    router.check_health()
+    router.check_health()
+    assert router.replicas[0].healthy
+
+    router.check_health()
+    assert not router.replicas[0].healthy
+    assert router.get_uri("SELECT 1") == PRIMARY
+
+
+def test_replica_readmitted_after_successful_health_check(fake_connect):
+    router = ReplicaRouter(PRIMARY, REPLICAS[:1], max_failures=1)
+    fake_connect["down"].add(REPLICAS[0])
+    router.check_health()
+    assert not router.replicas[0].healthy
+
+    fake_connect["down"].clear()
+    router.check_health()
+    assert router.replicas[0].healthy
+    assert router.replicas[0].failures == 0
+    assert router.get_uri("SELECT 1") == REPLICAS[0]
+
+
+def test_write_queries_go_to_primary(fake_connect):
+    router = ReplicaRouter(PRIMARY, REPLICAS)
+    assert router.get_uri("DELETE FROM produtos") == PRIMARY
+
+    with router.connection_for("UPDATE produtos SET preco = 1") as conn:
+        assert conn.database_uri == PRIMARY
+
+
+def test_falls_back_to_primary_when_replica_does_not_connect(fake_connect):
+    router = ReplicaRouter(PRIMARY, REPLICAS[:1], max_failures=1, connect_timeout=2)
+    fake_connect["down"].add(REPLICAS[0])
+
+    with router.connection_for("SELECT nome FROM produtos") as conn:
+        assert conn.database_uri == PRIMARY
+
+    assert not router.replicas[0].healthy
+    assert router.replicas[0].active_connections == 0
+    # A réplica é aberta com timeout; o primário mantém o padrão
+    assert fake_connect["calls"][0] == (REPLICAS[0], {"connect_timeout": 2})
+    assert fake_connect["calls"][1] == (PRIMARY, {})
+
+
+def test_replica_connection_is_read_only(fake_connect):
+    router = ReplicaRouter(PRIMARY, REPLICAS[:1])
+    with router.connection_for("SELECT 1") as conn:
+        assert conn.database_uri == REPLICAS[0]
+        assert conn.conn.readonly
+        assert router.replicas[0].active_connections == 1
+    assert router.replicas[0].active_connections == 0
+
+
+def test_failure_inside_block_counts_against_replica(fake_connect):
+    router = ReplicaRouter(PRIMARY, REPLICAS[:1], max_failures=1)
+    with pytest.raises(psycopg2.OperationalError):
+        with router.connection_for("SELECT 1"):
+            raise psycopg2.OperationalError("conexão perdida")
+    assert not router.replicas[0].healthy
+
+
+def test_least_connections_strategy():
+    router = ReplicaRouter(PRIMARY, REPLICAS, strategy="least_connections")
+    router.replicas[0].active_connections = 2
+    router.replicas[1].active_connections = 1
+    router.replicas[2].active_connections = 3
+    assert router.choose_replica() is router.replicas[1]
+
+
+def test_latency_strategy():
+    router = ReplicaRouter(PRIMARY, REPLICAS, strategy="latency")
+    router.replicas[0].latency = 0.050
+    router.replicas[1].latency = 0.010
+    router.replicas[1].active_connections = 4  # 5 x 10ms = 50ms
+    router.replicas[2].latency = 0.020  # 1 x 20ms
+    assert router.choose_replica() is router.replicas[2]
+
+
+def test_invalid_strategy():
+    with pytest.raises(ValueError):
+        ReplicaRouter(PRIMARY, REPLICAS, strategy="random")
+
+
+def test_concurrent_acquires_are_spread_across_replicas():
+    router = ReplicaRouter(PRIMARY, REPLICAS)
+    barrier = threading.Barrier(6)
+    chosen = []
+
+    def _acquire():
+        barrier.wait()
+        chosen.append(router.acquire_replica().uri)
+
+    threads = [threading.Thread(target=_acquire) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(chosen) == sorted(REPLICAS * 2)
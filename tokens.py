@@ -0,0 +1,5 @@
+def estimate_tokens(text):
+    """
+    Estimativa barata do número de tokens (~4 caracteres por token).
+    """
+    return (len(text) + 3) // 4 if text else 0